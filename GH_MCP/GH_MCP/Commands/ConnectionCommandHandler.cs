@@ -18,6 +18,14 @@ namespace GH_MCP.Commands
     /// </summary>
     public class ConnectionCommandHandler
     {
+        /// <summary>
+        /// 可自動選擇第二個輸入的多輸入數學組件（需與 Python 端 _MULTI_INPUT_MATH 保持一致）
+        /// </summary>
+        private static readonly HashSet<string> MultiInputMathComponents = new HashSet<string>(StringComparer.OrdinalIgnoreCase)
+        {
+            "Addition", "Subtraction", "Multiplication", "Division", "Math"
+        };
+
         /// <summary>
         /// 連接兩個組件
         /// </summary>
@@ -73,6 +81,13 @@ namespace GH_MCP.Commands
                 }
             }
 
+            // 未指定目標參數時，是否在第一個輸入已被佔用的情況下自動連接到第二個輸入
+            bool autoSelectSecondInput = false;
+            if (command.Parameters.TryGetValue("autoSelectBInputIfAOccupied", out object autoSelectObj) && autoSelectObj != null)
+            {
+                bool.TryParse(autoSelectObj.ToString(), out autoSelectSecondInput);
+            }
+
             // 記錄連接信息
             RhinoApp.WriteLine($"Connecting: sourceId={sourceId}, sourceParam={sourceParam}, targetId={targetId}, targetParam={targetParam}");
 
@@ -93,8 +108,16 @@ namespace GH_MCP.Commands
                 }
             };
 
+            // 目標參數可能在 UI 線程上自動選擇時，先只檢查目標組件 ID，目標參數在確定組件類型後再檢查
+            bool deferTargetParameter = autoSelectSecondInput &&
+                string.IsNullOrEmpty(targetParam) &&
+                !targetParamIndex.HasValue;
+
             // 檢查連接是否有效
-            if (!connection.IsValid())
+            bool isValid = deferTargetParameter
+                ? connection.Source.IsValid() && !string.IsNullOrEmpty(connection.Target.ComponentId)
+                : connection.IsValid();
+            if (!isValid)
             {
                 return Response.CreateError("Invalid connection parameters");
             }
@@ -159,6 +182,22 @@ namespace GH_MCP.Commands
                         return;
                     }
 
+                    // 對於多輸入組件（如 Addition），第一個輸入已有連接時自動選擇第二個輸入
+                    if (deferTargetParameter &&
+                        targetComponent is IGH_Component multiInputComponent &&
+                        MultiInputMathComponents.Contains(multiInputComponent.Name) &&
+                        multiInputComponent.Params.Input.Count >= 2)
+                    {
+                        connection.Target.ParameterIndex = multiInputComponent.Params.Input[0].SourceCount > 0 ? 1 : 0;
+                    }
+
+                    // 目標不是多輸入數學組件時，與 connect_components 一樣要求提供目標參數
+                    if (!connection.IsValid())
+                    {
+                        exception = new ArgumentException("Invalid connection parameters");
+                        return;
+                    }
+
                     // 獲取源參數
                     IGH_Param sourceParameter = GetParameter(sourceComponent, connection.Source, false);
                     if (sourceParameter == null)
@@ -525,7 +564,7 @@ namespace GH_MCP.Commands
 
         public bool IsValid()
         {
-            return Source != null && Target != null;
+            return Source != null && Target != null && Source.IsValid() && Target.IsValid();
         }
     }
 
@@ -534,5 +573,11 @@ namespace GH_MCP.Commands
         public string ComponentId { get; set; }
         public string ParameterName { get; set; }
         public int? ParameterIndex { get; set; }
+
+        public bool IsValid()
+        {
+            return !string.IsNullOrEmpty(ComponentId) &&
+                   (!string.IsNullOrEmpty(ParameterName) || ParameterIndex.HasValue);
+        }
     }
 }
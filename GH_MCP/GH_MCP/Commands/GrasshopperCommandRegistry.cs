@@ -63,6 +63,9 @@ namespace GH_MCP.Commands
             // 連接組件
             RegisterCommand("connect_components", ConnectionCommandHandler.ConnectComponents);
             
+            // 連接組件並在服務端自動選擇多輸入組件的目標參數
+            RegisterCommand("connect_components_smart", ConnectionCommandHandler.ConnectComponents);
+            
             // 設置組件值
             RegisterCommand("set_component_value", ComponentCommandHandler.SetComponentValue);
             
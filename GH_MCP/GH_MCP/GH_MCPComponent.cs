@@ -22,6 +22,8 @@ namespace GrasshopperMCP
     {
         private static TcpListener listener;
         private static bool isRunning = false;
+        private static readonly HashSet<TcpClient> activeClients = new HashSet<TcpClient>();
+        private static readonly object activeClientsLock = new object();
         private static int grasshopperPort = 8080;
         
         /// <summary>
@@ -133,6 +135,17 @@ namespace GrasshopperMCP
             
             isRunning = false;
             listener.Stop();
+            
+            // 關閉仍保持打開的客戶端連接，停止後不再執行任何命令
+            lock (activeClientsLock)
+            {
+                foreach (var client in activeClients)
+                {
+                    client.Close();
+                }
+                activeClients.Clear();
+            }
+            
             RhinoApp.WriteLine("GrasshopperMCPBridge stopped.");
         }
         
@@ -168,6 +181,43 @@ namespace GrasshopperMCP
         /// </summary>
         /// <param name="client">TCP 客戶端</param>
         private static async Task HandleClient(TcpClient client)
+        {
+            lock (activeClientsLock)
+            {
+                if (!isRunning)
+                {
+                    client.Close();
+                    return;
+                }
+                activeClients.Add(client);
+            }
+            
+            try
+            {
+                await ServeClient(client);
+            }
+            catch (ObjectDisposedException)
+            {
+                // 伺服器停止時連接已被關閉
+            }
+            catch (InvalidOperationException)
+            {
+                // 伺服器停止時連接已被關閉，無法再獲取網絡流
+            }
+            finally
+            {
+                lock (activeClientsLock)
+                {
+                    activeClients.Remove(client);
+                }
+            }
+        }
+        
+        /// <summary>
+        /// 在同一連接上依次處理命令，直到客戶端關閉連接或伺服器停止
+        /// </summary>
+        /// <param name="client">TCP 客戶端</param>
+        private static async Task ServeClient(TcpClient client)
         {
             using (client)
             using (var stream = client.GetStream())
@@ -176,39 +226,68 @@ namespace GrasshopperMCP
             {
                 try
                 {
-                    // 讀取命令
-                    string commandJson = await reader.ReadLineAsync();
-                    if (string.IsNullOrEmpty(commandJson))
+                    // 同一連接上可連續發送多條命令（每行一條），直到客戶端關閉連接或伺服器停止
+                    string commandJson;
+                    while (isRunning && (commandJson = await reader.ReadLineAsync()) != null)
                     {
-                        return;
+                        if (!isRunning)
+                        {
+                            break;
+                        }
+                        
+                        if (string.IsNullOrEmpty(commandJson))
+                        {
+                            continue;
+                        }
+                        
+                        await HandleCommand(commandJson, writer);
                     }
-                    
-                    // 更新最後接收的命令
-                    LastCommand = commandJson;
-                    
-                    // 解析命令
-                    Command command = JsonConvert.DeserializeObject<Command>(commandJson);
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge: Received command: {command.Type}");
-                    
-                    // 執行命令
-                    Response response = GrasshopperCommandRegistry.ExecuteCommand(command);
-                    
-                    // 發送響應
-                    string responseJson = JsonConvert.SerializeObject(response);
-                    await writer.WriteLineAsync(responseJson);
-                    
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge: Command {command.Type} executed with result: {(response.Success ? "Success" : "Error")}");
                 }
-                catch (Exception ex)
+                catch (IOException ex)
                 {
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge error handling client: {ex.Message}");
-                    
-                    // 發送錯誤響應
-                    Response errorResponse = Response.CreateError($"Server error: {ex.Message}");
-                    string errorResponseJson = JsonConvert.SerializeObject(errorResponse);
-                    await writer.WriteLineAsync(errorResponseJson);
+                    RhinoApp.WriteLine($"GrasshopperMCPBridge: Client disconnected: {ex.Message}");
                 }
             }
         }
+        
+        /// <summary>
+        /// 處理單條命令並寫回響應
+        /// </summary>
+        /// <param name="commandJson">命令 JSON</param>
+        /// <param name="writer">響應寫入器</param>
+        private static async Task HandleCommand(string commandJson, StreamWriter writer)
+        {
+            try
+            {
+                // 更新最後接收的命令
+                LastCommand = commandJson;
+                
+                // 解析命令
+                Command command = JsonConvert.DeserializeObject<Command>(commandJson);
+                RhinoApp.WriteLine($"GrasshopperMCPBridge: Received command: {command.Type}");
+                
+                // 執行命令
+                Response response = GrasshopperCommandRegistry.ExecuteCommand(command);
+                
+                // 發送響應
+                string responseJson = JsonConvert.SerializeObject(response);
+                await writer.WriteLineAsync(responseJson);
+                
+                RhinoApp.WriteLine($"GrasshopperMCPBridge: Command {command.Type} executed with result: {(response.Success ? "Success" : "Error")}");
+            }
+            catch (IOException)
+            {
+                throw;
+            }
+            catch (Exception ex)
+            {
+                RhinoApp.WriteLine($"GrasshopperMCPBridge error handling client: {ex.Message}");
+                
+                // 發送錯誤響應
+                Response errorResponse = Response.CreateError($"Server error: {ex.Message}");
+                string errorResponseJson = JsonConvert.SerializeObject(errorResponse);
+                await writer.WriteLineAsync(errorResponseJson);
+            }
+        }
     }
 }
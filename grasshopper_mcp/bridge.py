@@ -1,9 +1,25 @@
 import socket
 import json
+import logging
 import os
+import queue
 import sys
+import threading
+import time
 import traceback
-from typing import Dict, Any, Optional, List
+from collections import defaultdict
+from typing import Dict, Any, Optional, List, Tuple, BinaryIO
+
+# 優先使用 orjson（可選依賴）加速 JSON 序列化，未安裝時退回標準庫
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    
+    _loads = json.loads
 
 # 使用 MCP 服務器
 from mcp.server.fastmcp import FastMCP
@@ -11,10 +27,161 @@ from mcp.server.fastmcp import FastMCP
 # 設置 Grasshopper MCP 連接參數
 GRASSHOPPER_HOST = "localhost"
 GRASSHOPPER_PORT = 8080  # 默認端口，可以根據需要修改
+GRASSHOPPER_UDS = os.environ.get("GRASSHOPPER_UDS")  # 設置後改用該路徑的 Unix domain socket 連接
+RESPONSE_BUFFER_SIZE = 131072  # 響應讀取緩衝區大小，大型響應（如 get_all_components）可少做系統調用
+RESPONSE_CACHE_TTL = 0.25  # 只讀命令響應的緩存時間（秒）
+CONNECTION_POOL_SIZE = 4  # 最多同時保持的連接數，即可並發執行的命令數
+CONNECTION_POOL_TIMEOUT = 30  # 等待空閒連接的最長時間（秒）
+ERROR_LOG_INTERVAL = 60  # 相同錯誤的最短記錄間隔（秒）
 
 # 創建 MCP 服務器
 server = FastMCP("Grasshopper Bridge")
 
+# 通信日誌默認只輸出 WARNING 以上級別，調試信息需設置 GRASSHOPPER_MCP_LOG_LEVEL=DEBUG
+_LOG = logging.getLogger(__name__)
+
+# 到 Grasshopper MCP 的持久連接池，每個進行中的命令獨佔一個連接；
+# 池中預先放入 None 佔位，取到 None 時再建立連接，因此連接數不超過池大小
+_pool = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)
+for _ in range(CONNECTION_POOL_SIZE):
+    _pool.put_nowait(None)
+
+def _connect() -> Tuple[socket.socket, BinaryIO]:
+    """建立到 Grasshopper MCP 的新連接，返回 socket 及其緩衝讀取器"""
+    if GRASSHOPPER_UDS:
+        # 兩端在同一台機器上時跳過 TCP/IP 協議棧
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = GRASSHOPPER_UDS
+    else:
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        address = (GRASSHOPPER_HOST, GRASSHOPPER_PORT)
+    try:
+        client.connect(address)
+    except OSError:
+        client.close()
+        raise
+    return client, client.makefile("rb", buffering=RESPONSE_BUFFER_SIZE)
+
+def _close_conn(conn: Tuple[socket.socket, BinaryIO]):
+    """關閉一個連接"""
+    client, rfile = conn
+    rfile.close()
+    client.close()
+
+# 命令以換行結尾；支持 sendmsg 的平台上分散寫入，省去拼接命令字節
+_NL = b"\n"
+_BOM = b"\xef\xbb\xbf"
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+def _send_line(client: socket.socket, data: bytes):
+    """發送一行命令（data 加換行符）"""
+    if _HAS_SENDMSG:
+        sent = client.sendmsg((data, _NL))
+        if sent < len(data) + 1:
+            # 極少出現的部分寫入，補發剩餘字節
+            client.sendall((data + _NL)[sent:])
+    else:
+        # Windows 沒有 sendmsg；分兩次 send 在 TCP_NODELAY 下會拆成兩個報文，因此仍然拼接
+        client.sendall(data + _NL)
+
+def _roundtrip(command_bytes: bytes) -> bytes:
+    """從連接池取出連接，發送一條命令並讀取一行響應，連接失效時重連並重試一次"""
+    try:
+        conn = _pool.get(timeout=CONNECTION_POOL_TIMEOUT)
+    except queue.Empty:
+        raise TimeoutError("No free connection to Grasshopper") from None
+    
+    try:
+        for attempt in range(2):
+            if conn is None:
+                conn = _connect()
+            client, rfile = conn
+            try:
+                _send_line(client, command_bytes)
+                line = rfile.readline()
+                if not line:
+                    # 對端已關閉連接（例如舊版插件在每條命令後斷開）
+                    raise ConnectionError("Connection closed by Grasshopper")
+                return line
+            except OSError:
+                _close_conn(conn)
+                conn = None
+                if attempt:
+                    raise
+    finally:
+        # 歸還連接；失效的連接以 None 佔位，下次使用時重新建立
+        _pool.put_nowait(conn)
+
+# 不會修改文檔的命令，短時間內的重複調用直接返回緩存的響應
+_READ_ONLY_COMMANDS = frozenset({
+    "get_document_info",
+    "get_all_components",
+    "get_connections",
+    "get_available_patterns",
+    "get_component_parameters",
+    "search_components",
+    "get_component_info"
+})
+_RESPONSE_CACHE_MAX = 128
+
+# 緩存原始響應字節，每次命中都重新解析，調用方可以安全地修改返回結果
+_cache_lock = threading.Lock()
+_response_cache: Dict[bytes, Tuple[float, bytes]] = {}
+# 每次清空緩存時遞增；並發執行的只讀命令據此丟棄在修改命令之前讀到的響應
+_cache_generation = 0
+
+def _get_cache_generation() -> int:
+    """返回當前緩存代數"""
+    with _cache_lock:
+        return _cache_generation
+
+def _get_cached_response(command_bytes: bytes) -> Optional[bytes]:
+    """返回未過期的只讀命令響應，沒有則返回 None"""
+    with _cache_lock:
+        entry = _response_cache.get(command_bytes)
+    if entry is not None and time.monotonic() - entry[0] < RESPONSE_CACHE_TTL:
+        return entry[1]
+    return None
+
+def _store_cached_response(command_bytes: bytes, response_data: bytes, generation: int):
+    """緩存只讀命令的響應；發送命令後緩存被清空過則不緩存"""
+    with _cache_lock:
+        if generation != _cache_generation:
+            return
+        if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+            _response_cache.clear()
+        _response_cache[command_bytes] = (time.monotonic(), response_data)
+
+def _clear_response_cache():
+    """清空只讀命令的響應緩存"""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _response_cache.clear()
+
+# 同一錯誤在時間窗口內只記錄一次，避免客戶端頻繁輪詢時刷屏
+_error_log_times: Dict[Tuple[str, str], float] = {}
+_error_log_lock = threading.Lock()
+
+def _log_error(context: str, e: Exception):
+    """按時間窗口記錄錯誤，相同錯誤在 ERROR_LOG_INTERVAL 內只記錄一次；完整堆棧僅在 DEBUG 級別輸出"""
+    key = (context, str(e))
+    now = time.monotonic()
+    with _error_log_lock:
+        last = _error_log_times.get(key)
+        if last is not None and now - last < ERROR_LOG_INTERVAL:
+            return
+        if len(_error_log_times) >= 64:
+            _error_log_times.clear()
+        _error_log_times[key] = now
+    
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.exception("%s: %s", context, e)
+    else:
+        _LOG.warning("%s: %s", context, e)
+
 def send_to_grasshopper(command_type: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """向 Grasshopper MCP 發送命令"""
     if params is None:
@@ -27,43 +194,86 @@ def send_to_grasshopper(command_type: str, params: Optional[Dict[str, Any]] = No
     }
     
     try:
-        print(f"Sending command to Grasshopper: {command_type} with params: {params}", file=sys.stderr)
+        _LOG.debug("Sending command to Grasshopper: %s with params: %s", command_type, params)
         
-        # 連接到 Grasshopper MCP
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.connect((GRASSHOPPER_HOST, GRASSHOPPER_PORT))
-        
-        # 發送命令
-        command_json = json.dumps(command)
-        client.sendall((command_json + "\n").encode("utf-8"))
-        print(f"Command sent: {command_json}", file=sys.stderr)
+        # 序列化後的命令同時作為只讀緩存的鍵
+        command_bytes = _dumps(command)
+        read_only = command_type in _READ_ONLY_COMMANDS
+        response_data = _get_cached_response(command_bytes) if read_only else None
+        fetched = response_data is None
         
-        # 接收響應
-        response_data = b""
-        while True:
-            chunk = client.recv(4096)
-            if not chunk:
-                break
-            response_data += chunk
-            if response_data.endswith(b"\n"):
-                break
+        if fetched:
+            # 修改命令可能改變文檔狀態，之前緩存的只讀響應不再可信
+            if read_only:
+                generation = _get_cache_generation()
+            else:
+                _clear_response_cache()
+            
+            # 通過持久連接發送命令並接收響應（以換行分隔的 JSON）
+            try:
+                response_data = _roundtrip(command_bytes)
+            finally:
+                # 修改命令執行期間並發讀取的響應可能是修改前的狀態，完成後再次使其失效
+                if not read_only:
+                    _clear_response_cache()
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("Command sent: %s", command_bytes.decode("utf-8"))
         
-        # 處理可能的 BOM
-        response_str = response_data.decode("utf-8-sig").strip()
-        print(f"Response received: {response_str}", file=sys.stderr)
+        # 處理可能的 BOM（插件只在每個連接的第一條響應前寫入）
+        if response_data.startswith(_BOM):
+            response_data = response_data[3:]
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Response received: %s", response_data.decode("utf-8").rstrip())
         
-        # 解析 JSON 響應
-        response = json.loads(response_str)
-        client.close()
+        # 解析 JSON 響應，直接解析字節，結尾的換行符作為空白被忽略
+        response = _loads(response_data)
+        if read_only and fetched:
+            _store_cached_response(command_bytes, response_data, generation)
         return response
     except Exception as e:
-        print(f"Error communicating with Grasshopper: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        _log_error("Error communicating with Grasshopper", e)
         return {
             "success": False,
             "error": f"Error communicating with Grasshopper: {str(e)}"
         }
 
+# 常見的組件名稱混淆問題，鍵為小寫名稱，只在導入時構建一次
+_COMPONENT_MAP = {
+    # Number Slider 的各種可能輸入方式
+    "number slider": "Number Slider",
+    "numeric slider": "Number Slider",
+    "num slider": "Number Slider",
+    "slider": "Number Slider",  # 當只提到 slider 且上下文是數值時，預設為 Number Slider
+    
+    # 其他組件的標準化名稱
+    "md slider": "MD Slider",
+    "multidimensional slider": "MD Slider",
+    "multi-dimensional slider": "MD Slider",
+    "graph mapper": "Graph Mapper",
+    
+    # 數學運算組件
+    "add": "Addition",
+    "addition": "Addition",
+    "plus": "Addition",
+    "sum": "Addition",
+    "subtract": "Subtraction",
+    "subtraction": "Subtraction",
+    "minus": "Subtraction",
+    "difference": "Subtraction",
+    "multiply": "Multiplication",
+    "multiplication": "Multiplication",
+    "times": "Multiplication",
+    "product": "Multiplication",
+    "divide": "Division",
+    "division": "Division",
+    
+    # 輸出組件
+    "panel": "Panel",
+    "text panel": "Panel",
+    "output panel": "Panel",
+    "display": "Panel"
+}
+
 # 註冊 MCP 工具
 @server.tool("add_component")
 def add_component(component_type: str, x: float, y: float):
@@ -78,48 +288,12 @@ def add_component(component_type: str, x: float, y: float):
     Returns:
         Result of adding the component
     """
-    # 處理常見的組件名稱混淆問題
-    component_mapping = {
-        # Number Slider 的各種可能輸入方式
-        "number slider": "Number Slider",
-        "numeric slider": "Number Slider",
-        "num slider": "Number Slider",
-        "slider": "Number Slider",  # 當只提到 slider 且上下文是數值時，預設為 Number Slider
-        
-        # 其他組件的標準化名稱
-        "md slider": "MD Slider",
-        "multidimensional slider": "MD Slider",
-        "multi-dimensional slider": "MD Slider",
-        "graph mapper": "Graph Mapper",
-        
-        # 數學運算組件
-        "add": "Addition",
-        "addition": "Addition",
-        "plus": "Addition",
-        "sum": "Addition",
-        "subtract": "Subtraction",
-        "subtraction": "Subtraction",
-        "minus": "Subtraction",
-        "difference": "Subtraction",
-        "multiply": "Multiplication",
-        "multiplication": "Multiplication",
-        "times": "Multiplication",
-        "product": "Multiplication",
-        "divide": "Division",
-        "division": "Division",
-        
-        # 輸出組件
-        "panel": "Panel",
-        "text panel": "Panel",
-        "output panel": "Panel",
-        "display": "Panel"
-    }
-    
     # 檢查並修正組件類型
     normalized_type = component_type.lower()
-    if normalized_type in component_mapping:
-        component_type = component_mapping[normalized_type]
-        print(f"Component type normalized from '{normalized_type}' to '{component_mapping[normalized_type]}'", file=sys.stderr)
+    mapped_type = _COMPONENT_MAP.get(normalized_type)
+    if mapped_type is not None:
+        component_type = mapped_type
+        _LOG.debug("Component type normalized from '%s' to '%s'", normalized_type, mapped_type)
     
     params = {
         "type": component_type,
@@ -173,6 +347,42 @@ def get_document_info():
     """Get information about the Grasshopper document"""
     return send_to_grasshopper("get_document_info")
 
+# 有 A/B 兩個輸入、需要自動分配目標輸入的組件類型（需與插件端 MultiInputMathComponents 保持一致）
+_MULTI_INPUT_MATH = frozenset({"Addition", "Subtraction", "Multiplication", "Division", "Math"})
+
+def _is_unsupported_command(result: Dict[str, Any]) -> bool:
+    """判斷 Grasshopper 是否因為未註冊該命令而返回錯誤"""
+    return not result.get("success", True) and "No handler registered" in (result.get("error") or "")
+
+def _select_target_param(target_id: str) -> Optional[str]:
+    """為多輸入組件選擇目標參數：第一個輸入已被佔用時返回 B，否則返回 A"""
+    # 獲取目標組件的信息，檢查是否已有連接
+    target_info = send_to_grasshopper("get_component_info", {"componentId": target_id})
+    
+    # 檢查組件類型，如果是需要多個輸入的組件（如 Addition, Subtraction 等），智能分配輸入
+    if target_info and "result" in target_info and "type" in target_info["result"]:
+        component_type = target_info["result"]["type"]
+        
+        # 對於特定需要多個輸入的組件，自動選擇正確的輸入端口
+        if component_type in _MULTI_INPUT_MATH:
+            # 獲取現有連接
+            connections = send_to_grasshopper("get_connections")
+            existing_connections = connections.get("result", []) if connections else []
+            
+            # 檢查第一個輸入是否已被佔用
+            first_input_occupied = any(
+                conn.get("targetId") == target_id and
+                (conn.get("targetParam") == "A" or conn.get("targetParamIndex") == 0)
+                for conn in existing_connections
+            )
+            
+            # 如果第一個輸入已被佔用，則連接到第二個輸入
+            if first_input_occupied:
+                return "B"  # 第二個輸入通常命名為 B
+            return "A"  # 否則連接到第一個輸入
+    
+    return None
+
 @server.tool("connect_components")
 def connect_components(source_id: str, target_id: str, source_param: str = None, target_param: str = None, source_param_index: int = None, target_param_index: int = None):
     """
@@ -189,53 +399,28 @@ def connect_components(source_id: str, target_id: str, source_param: str = None,
     Returns:
         Result of connecting the components
     """
-    # 獲取目標組件的信息，檢查是否已有連接
-    target_info = send_to_grasshopper("get_component_info", {"componentId": target_id})
-    
-    # 檢查組件類型，如果是需要多個輸入的組件（如 Addition, Subtraction 等），智能分配輸入
-    if target_info and "result" in target_info and "type" in target_info["result"]:
-        component_type = target_info["result"]["type"]
-        
-        # 獲取現有連接
-        connections = send_to_grasshopper("get_connections")
-        existing_connections = []
-        
-        if connections and "result" in connections:
-            for conn in connections["result"]:
-                if conn.get("targetId") == target_id:
-                    existing_connections.append(conn)
-        
-        # 對於特定需要多個輸入的組件，自動選擇正確的輸入端口
-        if component_type in ["Addition", "Subtraction", "Multiplication", "Division", "Math"]:
-            # 如果沒有指定目標參數，且已有連接到第一個輸入，則自動連接到第二個輸入
-            if target_param is None and target_param_index is None:
-                # 檢查第一個輸入是否已被佔用
-                first_input_occupied = False
-                for conn in existing_connections:
-                    if conn.get("targetParam") == "A" or conn.get("targetParamIndex") == 0:
-                        first_input_occupied = True
-                        break
-                
-                # 如果第一個輸入已被佔用，則連接到第二個輸入
-                if first_input_occupied:
-                    target_param = "B"  # 第二個輸入通常命名為 B
-                else:
-                    target_param = "A"  # 否則連接到第一個輸入
+    # 只發送有值的參數；參數名稱優先於索引
+    params = {key: value for key, value in (
+        ("sourceId", source_id),
+        ("targetId", target_id),
+        ("sourceParam", source_param),
+        ("sourceParamIndex", source_param_index if source_param is None else None),
+        ("targetParam", target_param),
+        ("targetParamIndex", target_param_index if target_param is None else None),
+        # 由 Grasshopper 端根據現有連接自動選擇多輸入組件的 A/B 輸入
+        ("autoSelectBInputIfAOccupied", True)
+    ) if value is not None}
     
-    params = {
-        "sourceId": source_id,
-        "targetId": target_id
-    }
+    result = send_to_grasshopper("connect_components_smart", params)
+    if not _is_unsupported_command(result):
+        return result
     
-    if source_param is not None:
-        params["sourceParam"] = source_param
-    elif source_param_index is not None:
-        params["sourceParamIndex"] = source_param_index
-        
-    if target_param is not None:
-        params["targetParam"] = target_param
-    elif target_param_index is not None:
-        params["targetParamIndex"] = target_param_index
+    # 舊版插件不支持 connect_components_smart，退回到客戶端檢查現有連接
+    del params["autoSelectBInputIfAOccupied"]
+    if target_param is None and target_param_index is None:
+        target_param = _select_target_param(target_id)
+        if target_param is not None:
+            params["targetParam"] = target_param
     
     return send_to_grasshopper("connect_components", params)
 
@@ -299,22 +484,19 @@ def get_component_info(component_id: str):
             component_type = component_data["type"]
             
             # 查詢組件庫，獲取該類型組件的詳細參數信息
-            component_library = get_component_library()
-            if "components" in component_library:
-                for lib_component in component_library["components"]:
-                    if lib_component.get("name") == component_type or lib_component.get("fullName") == component_type:
-                        # 將組件庫中的參數信息合併到返回結果中
-                        if "settings" in lib_component:
-                            component_data["availableSettings"] = lib_component["settings"]
-                        if "inputs" in lib_component:
-                            component_data["inputDetails"] = lib_component["inputs"]
-                        if "outputs" in lib_component:
-                            component_data["outputDetails"] = lib_component["outputs"]
-                        if "usage_examples" in lib_component:
-                            component_data["usageExamples"] = lib_component["usage_examples"]
-                        if "common_issues" in lib_component:
-                            component_data["commonIssues"] = lib_component["common_issues"]
-                        break
+            lib_component = _COMPONENT_LIBRARY_INDEX.get(component_type)
+            if lib_component is not None:
+                # 將組件庫中的參數信息合併到返回結果中
+                if "settings" in lib_component:
+                    component_data["availableSettings"] = lib_component["settings"]
+                if "inputs" in lib_component:
+                    component_data["inputDetails"] = lib_component["inputs"]
+                if "outputs" in lib_component:
+                    component_data["outputDetails"] = lib_component["outputs"]
+                if "usage_examples" in lib_component:
+                    component_data["usageExamples"] = lib_component["usage_examples"]
+                if "common_issues" in lib_component:
+                    component_data["commonIssues"] = lib_component["common_issues"]
             
             # 特殊處理某些組件類型
             if component_type == "Number Slider":
@@ -331,17 +513,28 @@ def get_component_info(component_id: str):
             # 添加組件的連接信息
             connections = send_to_grasshopper("get_connections")
             if connections and "result" in connections:
-                # 查找與該組件相關的所有連接
-                related_connections = []
-                for conn in connections["result"]:
-                    if conn.get("sourceId") == component_id or conn.get("targetId") == component_id:
-                        related_connections.append(conn)
+                # 查找與該組件相關的所有連接（單次遍歷）
+                related_connections = [
+                    conn for conn in connections["result"]
+                    if conn.get("sourceId") == component_id or conn.get("targetId") == component_id
+                ]
                 
                 if related_connections:
                     component_data["connections"] = related_connections
     
     return result
 
+def _index_connections_by_component(connections_data: List[Dict[str, Any]]) -> Dict[Any, List[Dict[str, Any]]]:
+    """一次遍歷所有連接，按源組件和目標組件 ID 分組"""
+    by_component = defaultdict(list)
+    for conn in connections_data:
+        source_id = conn.get("sourceId")
+        target_id = conn.get("targetId")
+        by_component[source_id].append(conn)
+        if target_id != source_id:
+            by_component[target_id].append(conn)
+    return by_component
+
 @server.tool("get_all_components")
 def get_all_components():
     """
@@ -350,57 +543,51 @@ def get_all_components():
     Returns:
         List of all components in the document with their IDs, types, and positions
     """
-    result = send_to_grasshopper("get_all_components")
+    # 讓 Grasshopper 在同一響應中返回滑桿設置和連接信息，避免逐個組件再次查詢
+    result = send_to_grasshopper("get_all_components", {"includeSettings": True, "includeConnections": True})
     
     # 增強返回結果，為每個組件添加更多參數信息
     if result and "result" in result:
         components = result["result"]
-        component_library = get_component_library()
+        library_index = _COMPONENT_LIBRARY_INDEX
         
-        # 獲取所有連接信息
-        connections = send_to_grasshopper("get_connections")
-        connections_data = connections.get("result", []) if connections else []
+        # 插件未內嵌連接信息時，只查詢一次連接並按組件 ID 建立索引
+        connections_by_component = None
+        if not any("connections" in component for component in components):
+            connections = send_to_grasshopper("get_connections")
+            connections_by_component = _index_connections_by_component(connections.get("result", []) if connections else [])
         
         # 為每個組件添加詳細信息
         for component in components:
             if "id" in component and "type" in component:
-                component_id = component["id"]
                 component_type = component["type"]
                 
                 # 添加組件的詳細參數信息
-                if "components" in component_library:
-                    for lib_component in component_library["components"]:
-                        if lib_component.get("name") == component_type or lib_component.get("fullName") == component_type:
-                            # 將組件庫中的參數信息合併到組件數據中
-                            if "settings" in lib_component:
-                                component["availableSettings"] = lib_component["settings"]
-                            if "inputs" in lib_component:
-                                component["inputDetails"] = lib_component["inputs"]
-                            if "outputs" in lib_component:
-                                component["outputDetails"] = lib_component["outputs"]
-                            break
+                lib_component = library_index.get(component_type)
+                if lib_component is not None:
+                    # 將組件庫中的參數信息合併到組件數據中
+                    if "settings" in lib_component:
+                        component["availableSettings"] = lib_component["settings"]
+                    if "inputs" in lib_component:
+                        component["inputDetails"] = lib_component["inputs"]
+                    if "outputs" in lib_component:
+                        component["outputDetails"] = lib_component["outputs"]
                 
                 # 添加組件的連接信息
-                related_connections = []
-                for conn in connections_data:
-                    if conn.get("sourceId") == component_id or conn.get("targetId") == component_id:
-                        related_connections.append(conn)
-                
-                if related_connections:
-                    component["connections"] = related_connections
+                if connections_by_component is not None:
+                    related_connections = connections_by_component.get(component["id"])
+                    if related_connections:
+                        component["connections"] = related_connections
                 
                 # 特殊處理某些組件類型
-                if component_type == "Number Slider":
-                    # 嘗試獲取滑桿的當前設置
-                    component_info = send_to_grasshopper("get_component_info", {"componentId": component_id})
-                    if component_info and "result" in component_info:
-                        info_data = component_info["result"]
-                        component["currentSettings"] = {
-                            "min": info_data.get("min", 0),
-                            "max": info_data.get("max", 10),
-                            "value": info_data.get("value", 5),
-                            "rounding": info_data.get("rounding", 0.1)
-                        }
+                if component_type == "Number Slider" and "currentSettings" not in component:
+                    # 從組件數據中提取滑桿的當前設置
+                    component["currentSettings"] = {
+                        "min": component.get("min", 0),
+                        "max": component.get("max", 10),
+                        "value": component.get("value", 5),
+                        "rounding": component.get("rounding", 0.1)
+                    }
     
     return result
 
@@ -462,18 +649,102 @@ def validate_connection(source_id: str, target_id: str, source_param: str = None
     Returns:
         Whether the connection is valid and any potential issues
     """
-    params = {
-        "sourceId": source_id,
-        "targetId": target_id
+    params = {key: value for key, value in (
+        ("sourceId", source_id),
+        ("targetId", target_id),
+        ("sourceParam", source_param),
+        ("targetParam", target_param)
+    ) if value is not None}
+    
+    return send_to_grasshopper("validate_connection", params)
+
+def _index_connection_summaries(connections_data: List[Dict[str, Any]]) -> Dict[Any, List[Dict[str, Any]]]:
+    """一次遍歷所有連接，按組件 ID 生成連接摘要：源組件記為 output，目標組件記為 input"""
+    by_component = defaultdict(list)
+    for conn in connections_data:
+        get = conn.get
+        source_id = get("sourceId")
+        target_id = get("targetId")
+        source_param = get("sourceParam", "")
+        target_param = get("targetParam", "")
+        by_component[source_id].append({
+            "type": "output",
+            "to": get("targetId", ""),
+            "sourceParam": source_param,
+            "targetParam": target_param
+        })
+        # 自連接只記為 output，與逐組件匹配時的結果一致
+        if target_id == source_id:
+            continue
+        by_component[target_id].append({
+            "type": "input",
+            "from": get("sourceId", ""),
+            "sourceParam": source_param,
+            "targetParam": target_param
+        })
+    return by_component
+
+def _summarize_component(component: Dict[str, Any], connection_summaries: Dict[Any, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """生成單個組件的狀態摘要，包括位置、參數設置和連接"""
+    get = component.get
+    summary = {
+        "id": get("id", ""),
+        "type": get("type", ""),
+        # 畫布坐標直接平鋪在摘要中
+        "x": get("x", 0),
+        "y": get("y", 0)
     }
     
-    if source_param is not None:
-        params["sourceParam"] = source_param
-        
-    if target_param is not None:
-        params["targetParam"] = target_param
+    # 添加組件特定的參數信息
+    if "currentSettings" in component:
+        summary["settings"] = component["currentSettings"]
+    elif get("type") == "Number Slider":
+        # 嘗試從組件信息中提取滑桿設置
+        summary["settings"] = {
+            "min": get("min", 0),
+            "max": get("max", 10),
+            "value": get("value", 5),
+            "rounding": get("rounding", 0.1)
+        }
     
-    return send_to_grasshopper("validate_connection", params)
+    # 添加連接信息摘要
+    related = connection_summaries.get(get("id"))
+    if related:
+        summary["connections"] = related
+    
+    return summary
+
+# 常用組件的提示信息和使用建議，內容固定不變，只在導入時構建一次
+_COMPONENT_HINTS = {
+    "Number Slider": {
+        "description": "Single numeric value slider with adjustable range",
+        "common_usage": "Use for single numeric inputs like radius, height, count, etc.",
+        "parameters": ["min", "max", "value", "rounding", "type"],
+        "NOT_TO_BE_CONFUSED_WITH": "MD Slider (which is for multi-dimensional values)"
+    },
+    "MD Slider": {
+        "description": "Multi-dimensional slider for vector input",
+        "common_usage": "Use for vector inputs, NOT for simple numeric values",
+        "NOT_TO_BE_CONFUSED_WITH": "Number Slider (which is for single numeric values)"
+    },
+    "Panel": {
+        "description": "Displays text or numeric data",
+        "common_usage": "Use for displaying outputs and debugging"
+    },
+    "Addition": {
+        "description": "Adds two or more numbers",
+        "common_usage": "Connect two Number Sliders to inputs A and B",
+        "parameters": ["A", "B"],
+        "connection_tip": "First slider should connect to input A, second to input B"
+    }
+}
+
+_RECOMMENDATIONS = (
+    "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider",
+    "For vector inputs (like 3D points), use 'MD Slider' or 'Construct Point' with multiple Number Sliders",
+    "Use 'Panel' to display outputs and debug values",
+    "When connecting multiple sliders to Addition, first slider goes to input A, second to input B"
+)
 
 # 註冊 MCP 資源
 @server.resource("grasshopper://status")
@@ -489,97 +760,23 @@ def get_grasshopper_status():
         
         # 獲取所有連接
         connections = send_to_grasshopper("get_connections")
+        conn_list = connections.get("result", []) if connections else []
         
-        # 添加常用組件的提示信息
-        component_hints = {
-            "Number Slider": {
-                "description": "Single numeric value slider with adjustable range",
-                "common_usage": "Use for single numeric inputs like radius, height, count, etc.",
-                "parameters": ["min", "max", "value", "rounding", "type"],
-                "NOT_TO_BE_CONFUSED_WITH": "MD Slider (which is for multi-dimensional values)"
-            },
-            "MD Slider": {
-                "description": "Multi-dimensional slider for vector input",
-                "common_usage": "Use for vector inputs, NOT for simple numeric values",
-                "NOT_TO_BE_CONFUSED_WITH": "Number Slider (which is for single numeric values)"
-            },
-            "Panel": {
-                "description": "Displays text or numeric data",
-                "common_usage": "Use for displaying outputs and debugging"
-            },
-            "Addition": {
-                "description": "Adds two or more numbers",
-                "common_usage": "Connect two Number Sliders to inputs A and B",
-                "parameters": ["A", "B"],
-                "connection_tip": "First slider should connect to input A, second to input B"
-            }
-        }
-        
-        # 為每個組件添加當前參數值的摘要
-        component_summaries = []
-        for component in components:
-            summary = {
-                "id": component.get("id", ""),
-                "type": component.get("type", ""),
-                "position": {
-                    "x": component.get("x", 0),
-                    "y": component.get("y", 0)
-                }
-            }
-            
-            # 添加組件特定的參數信息
-            if "currentSettings" in component:
-                summary["settings"] = component["currentSettings"]
-            elif component.get("type") == "Number Slider":
-                # 嘗試從組件信息中提取滑桿設置
-                summary["settings"] = {
-                    "min": component.get("min", 0),
-                    "max": component.get("max", 10),
-                    "value": component.get("value", 5),
-                    "rounding": component.get("rounding", 0.1)
-                }
-            
-            # 添加連接信息摘要
-            if "connections" in component:
-                conn_summary = []
-                for conn in component["connections"]:
-                    if conn.get("sourceId") == component.get("id"):
-                        conn_summary.append({
-                            "type": "output",
-                            "to": conn.get("targetId", ""),
-                            "sourceParam": conn.get("sourceParam", ""),
-                            "targetParam": conn.get("targetParam", "")
-                        })
-                    else:
-                        conn_summary.append({
-                            "type": "input",
-                            "from": conn.get("sourceId", ""),
-                            "sourceParam": conn.get("sourceParam", ""),
-                            "targetParam": conn.get("targetParam", "")
-                        })
-                
-                if conn_summary:
-                    summary["connections"] = conn_summary
-            
-            component_summaries.append(summary)
+        # 為每個組件添加當前參數值的摘要，連接摘要按組件 ID 預先建立索引
+        connection_summaries = _index_connection_summaries(conn_list)
+        component_summaries = [_summarize_component(component, connection_summaries) for component in components]
         
         return {
             "status": "Connected to Grasshopper",
             "document": doc_info.get("result", {}),
             "components": component_summaries,
-            "connections": connections.get("result", []),
-            "component_hints": component_hints,
-            "recommendations": [
-                "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider",
-                "For vector inputs (like 3D points), use 'MD Slider' or 'Construct Point' with multiple Number Sliders",
-                "Use 'Panel' to display outputs and debug values",
-                "When connecting multiple sliders to Addition, first slider goes to input A, second to input B"
-            ],
-            "canvas_summary": f"Current canvas has {len(component_summaries)} components and {len(connections.get('result', []))} connections"
+            "connections": conn_list,
+            "component_hints": _COMPONENT_HINTS,
+            "recommendations": _RECOMMENDATIONS,
+            "canvas_summary": f"Current canvas has {len(components)} components and {len(conn_list)} connections"
         }
     except Exception as e:
-        print(f"Error getting Grasshopper status: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        _log_error("Error getting Grasshopper status", e)
         return {
             "status": f"Error: {str(e)}",
             "document": {},
@@ -587,468 +784,502 @@ def get_grasshopper_status():
             "connections": []
         }
 
+# 組件指南內容固定不變，只在導入時構建一次
+_COMPONENT_GUIDE = {
+    "title": "Grasshopper Component Guide",
+    "description": "Guide for creating and connecting Grasshopper components",
+    "components": [
+        {
+            "name": "Point",
+            "category": "Params",
+            "description": "Creates a point at specific coordinates",
+            "inputs": [
+                {"name": "X", "type": "Number"},
+                {"name": "Y", "type": "Number"},
+                {"name": "Z", "type": "Number"}
+            ],
+            "outputs": [
+                {"name": "Pt", "type": "Point"}
+            ]
+        },
+        {
+            "name": "Circle",
+            "category": "Curve",
+            "description": "Creates a circle",
+            "inputs": [
+                {"name": "Plane", "type": "Plane", "description": "Base plane for the circle"},
+                {"name": "Radius", "type": "Number", "description": "Circle radius"}
+            ],
+            "outputs": [
+                {"name": "C", "type": "Circle"}
+            ]
+        },
+        {
+            "name": "XY Plane",
+            "category": "Vector",
+            "description": "Creates an XY plane at the world origin or at a specified point",
+            "inputs": [
+                {"name": "Origin", "type": "Point", "description": "Origin point", "optional": True}
+            ],
+            "outputs": [
+                {"name": "Plane", "type": "Plane", "description": "XY plane"}
+            ]
+        },
+        {
+            "name": "Addition",
+            "fullName": "Addition",
+            "description": "Adds two or more numbers",
+            "inputs": [
+                {"name": "A", "type": "Number", "description": "First input value"},
+                {"name": "B", "type": "Number", "description": "Second input value"}
+            ],
+            "outputs": [
+                {"name": "Result", "type": "Number", "description": "Sum of inputs"}
+            ],
+            "usage_examples": [
+                "Connect two Number Sliders to inputs A and B to add their values",
+                "Connect multiple values to add them all together"
+            ],
+            "common_issues": [
+                "When connecting multiple sliders, ensure they connect to different inputs (A and B)",
+                "The first slider should connect to input A, the second to input B"
+            ]
+        },
+        {
+            "name": "Number Slider",
+            "fullName": "Number Slider",
+            "description": "Creates a slider for numeric input with adjustable range and precision",
+            "inputs": [],
+            "outputs": [
+                {"name": "N", "type": "Number", "description": "Number output"}
+            ],
+            "settings": {
+                "min": {"description": "Minimum value of the slider", "default": 0},
+                "max": {"description": "Maximum value of the slider", "default": 10},
+                "value": {"description": "Current value of the slider", "default": 5},
+                "rounding": {"description": "Rounding precision (0.01, 0.1, 1, etc.)", "default": 0.1},
+                "type": {"description": "Slider type (integer, floating point)", "default": "float"},
+                "name": {"description": "Custom name for the slider", "default": ""}
+            },
+            "usage_examples": [
+                "Create a Number Slider with min=0, max=100, value=50",
+                "Create a Number Slider for radius with min=0.1, max=10, value=2.5, rounding=0.1"
+            ],
+            "common_issues": [
+                "Confusing with other slider types",
+                "Not setting appropriate min/max values for the intended use"
+            ],
+            "disambiguation": {
+                "similar_components": [
+                    {
+                        "name": "MD Slider",
+                        "description": "Multi-dimensional slider for vector input, NOT for simple numeric values",
+                        "how_to_distinguish": "Use Number Slider for single numeric values; use MD Slider only when you need multi-dimensional control"
+                    },
+                    {
+                        "name": "Graph Mapper",
+                        "description": "Maps values through a graph function, NOT a simple slider",
+                        "how_to_distinguish": "Use Number Slider for direct numeric input; use Graph Mapper only for function-based mapping"
+                    }
+                ],
+                "correct_usage": "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider or other variants"
+            }
+        },
+        {
+            "name": "Panel",
+            "fullName": "Panel",
+            "description": "Displays text or numeric data",
+            "inputs": [
+                {"name": "Input", "type": "Any"}
+            ],
+            "outputs": []
+        },
+        {
+            "name": "Math",
+            "fullName": "Mathematics",
+            "description": "Performs mathematical operations",
+            "inputs": [
+                {"name": "A", "type": "Number"},
+                {"name": "B", "type": "Number"}
+            ],
+            "outputs": [
+                {"name": "Result", "type": "Number"}
+            ],
+            "operations": ["Addition", "Subtraction", "Multiplication", "Division", "Power", "Modulo"]
+        },
+        {
+            "name": "Construct Point",
+            "fullName": "Construct Point",
+            "description": "Constructs a point from X, Y, Z coordinates",
+            "inputs": [
+                {"name": "X", "type": "Number"},
+                {"name": "Y", "type": "Number"},
+                {"name": "Z", "type": "Number"}
+            ],
+            "outputs": [
+                {"name": "Pt", "type": "Point"}
+            ]
+        },
+        {
+            "name": "Line",
+            "fullName": "Line",
+            "description": "Creates a line between two points",
+            "inputs": [
+                {"name": "Start", "type": "Point"},
+                {"name": "End", "type": "Point"}
+            ],
+            "outputs": [
+                {"name": "L", "type": "Line"}
+            ]
+        },
+        {
+            "name": "Extrude",
+            "fullName": "Extrude",
+            "description": "Extrudes a curve to create a surface or a solid",
+            "inputs": [
+                {"name": "Base", "type": "Curve"},
+                {"name": "Direction", "type": "Vector"},
+                {"name": "Height", "type": "Number"}
+            ],
+            "outputs": [
+                {"name": "Brep", "type": "Brep"}
+            ]
+        }
+    ],
+    "connectionRules": [
+        {
+            "from": "Number",
+            "to": "Circle.Radius",
+            "description": "Connect a number to the radius input of a circle"
+        },
+        {
+            "from": "Point",
+            "to": "Circle.Plane",
+            "description": "Connect a point to the plane input of a circle (not recommended, use XY Plane instead)"
+        },
+        {
+            "from": "XY Plane",
+            "to": "Circle.Plane",
+            "description": "Connect an XY Plane to the plane input of a circle (recommended)"
+        },
+        {
+            "from": "Number",
+            "to": "Math.A",
+            "description": "Connect a number to the first input of a Math component"
+        },
+        {
+            "from": "Number",
+            "to": "Math.B",
+            "description": "Connect a number to the second input of a Math component"
+        },
+        {
+            "from": "Number",
+            "to": "Construct Point.X",
+            "description": "Connect a number to the X input of a Construct Point component"
+        },
+        {
+            "from": "Number",
+            "to": "Construct Point.Y",
+            "description": "Connect a number to the Y input of a Construct Point component"
+        },
+        {
+            "from": "Number",
+            "to": "Construct Point.Z",
+            "description": "Connect a number to the Z input of a Construct Point component"
+        },
+        {
+            "from": "Point",
+            "to": "Line.Start",
+            "description": "Connect a point to the start input of a Line component"
+        },
+        {
+            "from": "Point",
+            "to": "Line.End",
+            "description": "Connect a point to the end input of a Line component"
+        },
+        {
+            "from": "Circle",
+            "to": "Extrude.Base",
+            "description": "Connect a circle to the base input of an Extrude component"
+        },
+        {
+            "from": "Number",
+            "to": "Extrude.Height",
+            "description": "Connect a number to the height input of an Extrude component"
+        }
+    ],
+    "commonIssues": [
+        "Using Point component instead of XY Plane for inputs that require planes",
+        "Not specifying parameter names when connecting components",
+        "Using incorrect component names (e.g., 'addition' instead of 'Math' with Addition operation)",
+        "Trying to connect incompatible data types",
+        "Not providing all required inputs for a component",
+        "Using incorrect parameter names (e.g., 'A' and 'B' for Math component instead of the actual parameter names)",
+        "Not checking if a connection was successful before proceeding"
+    ],
+    "tips": [
+        "Always use XY Plane component for plane inputs",
+        "Specify parameter names when connecting components",
+        "For Circle components, make sure to use the correct inputs (Plane and Radius)",
+        "Test simple connections before creating complex geometry",
+        "Avoid using components that require selection from Rhino",
+        "Use get_component_info to check the actual parameter names of a component",
+        "Use get_connections to verify if connections were established correctly",
+        "Use search_components to find the correct component name before adding it",
+        "Use validate_connection to check if a connection is possible before attempting it"
+    ]
+}
+
+# 資源內容不變，預先序列化為 JSON 文本，避免每次讀取資源時重新序列化
+_COMPONENT_GUIDE_JSON = _dumps(_COMPONENT_GUIDE).decode("utf-8")
+
 @server.resource("grasshopper://component_guide")
 def get_component_guide():
     """Get guide for Grasshopper components and connections"""
-    return {
-        "title": "Grasshopper Component Guide",
-        "description": "Guide for creating and connecting Grasshopper components",
-        "components": [
-            {
-                "name": "Point",
-                "category": "Params",
-                "description": "Creates a point at specific coordinates",
-                "inputs": [
-                    {"name": "X", "type": "Number"},
-                    {"name": "Y", "type": "Number"},
-                    {"name": "Z", "type": "Number"}
-                ],
-                "outputs": [
-                    {"name": "Pt", "type": "Point"}
-                ]
-            },
-            {
-                "name": "Circle",
-                "category": "Curve",
-                "description": "Creates a circle",
-                "inputs": [
-                    {"name": "Plane", "type": "Plane", "description": "Base plane for the circle"},
-                    {"name": "Radius", "type": "Number", "description": "Circle radius"}
-                ],
-                "outputs": [
-                    {"name": "C", "type": "Circle"}
-                ]
-            },
-            {
-                "name": "XY Plane",
-                "category": "Vector",
-                "description": "Creates an XY plane at the world origin or at a specified point",
-                "inputs": [
-                    {"name": "Origin", "type": "Point", "description": "Origin point", "optional": True}
-                ],
-                "outputs": [
-                    {"name": "Plane", "type": "Plane", "description": "XY plane"}
-                ]
-            },
-            {
-                "name": "Addition",
-                "fullName": "Addition",
-                "description": "Adds two or more numbers",
-                "inputs": [
-                    {"name": "A", "type": "Number", "description": "First input value"},
-                    {"name": "B", "type": "Number", "description": "Second input value"}
-                ],
-                "outputs": [
-                    {"name": "Result", "type": "Number", "description": "Sum of inputs"}
-                ],
-                "usage_examples": [
-                    "Connect two Number Sliders to inputs A and B to add their values",
-                    "Connect multiple values to add them all together"
-                ],
-                "common_issues": [
-                    "When connecting multiple sliders, ensure they connect to different inputs (A and B)",
-                    "The first slider should connect to input A, the second to input B"
-                ]
-            },
-            {
-                "name": "Number Slider",
-                "fullName": "Number Slider",
-                "description": "Creates a slider for numeric input with adjustable range and precision",
-                "inputs": [],
-                "outputs": [
-                    {"name": "N", "type": "Number", "description": "Number output"}
-                ],
-                "settings": {
-                    "min": {"description": "Minimum value of the slider", "default": 0},
-                    "max": {"description": "Maximum value of the slider", "default": 10},
-                    "value": {"description": "Current value of the slider", "default": 5},
-                    "rounding": {"description": "Rounding precision (0.01, 0.1, 1, etc.)", "default": 0.1},
-                    "type": {"description": "Slider type (integer, floating point)", "default": "float"},
-                    "name": {"description": "Custom name for the slider", "default": ""}
+    return _COMPONENT_GUIDE_JSON
+
+# 這個資源提供了一個更全面的組件庫，包括常用組件的詳細信息；內容固定不變，只在導入時構建一次
+_COMPONENT_LIBRARY = {
+    "categories": [
+        {
+            "name": "Params",
+            "components": [
+                {
+                    "name": "Point",
+                    "fullName": "Point Parameter",
+                    "description": "Creates a point parameter",
+                    "inputs": [
+                        {"name": "X", "type": "Number", "description": "X coordinate"},
+                        {"name": "Y", "type": "Number", "description": "Y coordinate"},
+                        {"name": "Z", "type": "Number", "description": "Z coordinate"}
+                    ],
+                    "outputs": [
+                        {"name": "Pt", "type": "Point", "description": "Point output"}
+                    ]
                 },
-                "usage_examples": [
-                    "Create a Number Slider with min=0, max=100, value=50",
-                    "Create a Number Slider for radius with min=0.1, max=10, value=2.5, rounding=0.1"
-                ],
-                "common_issues": [
-                    "Confusing with other slider types",
-                    "Not setting appropriate min/max values for the intended use"
-                ],
-                "disambiguation": {
-                    "similar_components": [
-                        {
-                            "name": "MD Slider",
-                            "description": "Multi-dimensional slider for vector input, NOT for simple numeric values",
-                            "how_to_distinguish": "Use Number Slider for single numeric values; use MD Slider only when you need multi-dimensional control"
-                        },
-                        {
-                            "name": "Graph Mapper",
-                            "description": "Maps values through a graph function, NOT a simple slider",
-                            "how_to_distinguish": "Use Number Slider for direct numeric input; use Graph Mapper only for function-based mapping"
-                        }
+                {
+                    "name": "Number Slider",
+                    "fullName": "Number Slider",
+                    "description": "Creates a slider for numeric input with adjustable range and precision",
+                    "inputs": [],
+                    "outputs": [
+                        {"name": "N", "type": "Number", "description": "Number output"}
+                    ],
+                    "settings": {
+                        "min": {"description": "Minimum value of the slider", "default": 0},
+                        "max": {"description": "Maximum value of the slider", "default": 10},
+                        "value": {"description": "Current value of the slider", "default": 5},
+                        "rounding": {"description": "Rounding precision (0.01, 0.1, 1, etc.)", "default": 0.1},
+                        "type": {"description": "Slider type (integer, floating point)", "default": "float"},
+                        "name": {"description": "Custom name for the slider", "default": ""}
+                    },
+                    "usage_examples": [
+                        "Create a Number Slider with min=0, max=100, value=50",
+                        "Create a Number Slider for radius with min=0.1, max=10, value=2.5, rounding=0.1"
                     ],
-                    "correct_usage": "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider or other variants"
+                    "common_issues": [
+                        "Confusing with other slider types",
+                        "Not setting appropriate min/max values for the intended use"
+                    ],
+                    "disambiguation": {
+                        "similar_components": [
+                            {
+                                "name": "MD Slider",
+                                "description": "Multi-dimensional slider for vector input, NOT for simple numeric values",
+                                "how_to_distinguish": "Use Number Slider for single numeric values; use MD Slider only when you need multi-dimensional control"
+                            },
+                            {
+                                "name": "Graph Mapper",
+                                "description": "Maps values through a graph function, NOT a simple slider",
+                                "how_to_distinguish": "Use Number Slider for direct numeric input; use Graph Mapper only for function-based mapping"
+                            }
+                        ],
+                        "correct_usage": "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider or other variants"
+                    }
+                },
+                {
+                    "name": "Panel",
+                    "fullName": "Panel",
+                    "description": "Displays text or numeric data",
+                    "inputs": [
+                        {"name": "Input", "type": "Any", "description": "Any input data"}
+                    ],
+                    "outputs": []
                 }
-            },
-            {
-                "name": "Panel",
-                "fullName": "Panel",
-                "description": "Displays text or numeric data",
-                "inputs": [
-                    {"name": "Input", "type": "Any"}
-                ],
-                "outputs": []
-            },
-            {
-                "name": "Math",
-                "fullName": "Mathematics",
-                "description": "Performs mathematical operations",
-                "inputs": [
-                    {"name": "A", "type": "Number"},
-                    {"name": "B", "type": "Number"}
-                ],
-                "outputs": [
-                    {"name": "Result", "type": "Number"}
-                ],
-                "operations": ["Addition", "Subtraction", "Multiplication", "Division", "Power", "Modulo"]
-            },
-            {
-                "name": "Construct Point",
-                "fullName": "Construct Point",
-                "description": "Constructs a point from X, Y, Z coordinates",
-                "inputs": [
-                    {"name": "X", "type": "Number"},
-                    {"name": "Y", "type": "Number"},
-                    {"name": "Z", "type": "Number"}
-                ],
-                "outputs": [
-                    {"name": "Pt", "type": "Point"}
-                ]
-            },
-            {
-                "name": "Line",
-                "fullName": "Line",
-                "description": "Creates a line between two points",
-                "inputs": [
-                    {"name": "Start", "type": "Point"},
-                    {"name": "End", "type": "Point"}
-                ],
-                "outputs": [
-                    {"name": "L", "type": "Line"}
-                ]
-            },
-            {
-                "name": "Extrude",
-                "fullName": "Extrude",
-                "description": "Extrudes a curve to create a surface or a solid",
-                "inputs": [
-                    {"name": "Base", "type": "Curve"},
-                    {"name": "Direction", "type": "Vector"},
-                    {"name": "Height", "type": "Number"}
-                ],
-                "outputs": [
-                    {"name": "Brep", "type": "Brep"}
-                ]
-            }
-        ],
-        "connectionRules": [
-            {
-                "from": "Number",
-                "to": "Circle.Radius",
-                "description": "Connect a number to the radius input of a circle"
-            },
-            {
-                "from": "Point",
-                "to": "Circle.Plane",
-                "description": "Connect a point to the plane input of a circle (not recommended, use XY Plane instead)"
-            },
-            {
-                "from": "XY Plane",
-                "to": "Circle.Plane",
-                "description": "Connect an XY Plane to the plane input of a circle (recommended)"
-            },
-            {
-                "from": "Number",
-                "to": "Math.A",
-                "description": "Connect a number to the first input of a Math component"
-            },
-            {
-                "from": "Number",
-                "to": "Math.B",
-                "description": "Connect a number to the second input of a Math component"
-            },
-            {
-                "from": "Number",
-                "to": "Construct Point.X",
-                "description": "Connect a number to the X input of a Construct Point component"
-            },
-            {
-                "from": "Number",
-                "to": "Construct Point.Y",
-                "description": "Connect a number to the Y input of a Construct Point component"
-            },
-            {
-                "from": "Number",
-                "to": "Construct Point.Z",
-                "description": "Connect a number to the Z input of a Construct Point component"
-            },
-            {
-                "from": "Point",
-                "to": "Line.Start",
-                "description": "Connect a point to the start input of a Line component"
-            },
-            {
-                "from": "Point",
-                "to": "Line.End",
-                "description": "Connect a point to the end input of a Line component"
-            },
-            {
-                "from": "Circle",
-                "to": "Extrude.Base",
-                "description": "Connect a circle to the base input of an Extrude component"
-            },
-            {
-                "from": "Number",
-                "to": "Extrude.Height",
-                "description": "Connect a number to the height input of an Extrude component"
-            }
-        ],
-        "commonIssues": [
-            "Using Point component instead of XY Plane for inputs that require planes",
-            "Not specifying parameter names when connecting components",
-            "Using incorrect component names (e.g., 'addition' instead of 'Math' with Addition operation)",
-            "Trying to connect incompatible data types",
-            "Not providing all required inputs for a component",
-            "Using incorrect parameter names (e.g., 'A' and 'B' for Math component instead of the actual parameter names)",
-            "Not checking if a connection was successful before proceeding"
-        ],
-        "tips": [
-            "Always use XY Plane component for plane inputs",
-            "Specify parameter names when connecting components",
-            "For Circle components, make sure to use the correct inputs (Plane and Radius)",
-            "Test simple connections before creating complex geometry",
-            "Avoid using components that require selection from Rhino",
-            "Use get_component_info to check the actual parameter names of a component",
-            "Use get_connections to verify if connections were established correctly",
-            "Use search_components to find the correct component name before adding it",
-            "Use validate_connection to check if a connection is possible before attempting it"
-        ]
-    }
+            ]
+        },
+        {
+            "name": "Maths",
+            "components": [
+                {
+                    "name": "Math",
+                    "fullName": "Mathematics",
+                    "description": "Performs mathematical operations",
+                    "inputs": [
+                        {"name": "A", "type": "Number", "description": "First number"},
+                        {"name": "B", "type": "Number", "description": "Second number"}
+                    ],
+                    "outputs": [
+                        {"name": "Result", "type": "Number", "description": "Result of the operation"}
+                    ],
+                    "operations": ["Addition", "Subtraction", "Multiplication", "Division", "Power", "Modulo"]
+                }
+            ]
+        },
+        {
+            "name": "Vector",
+            "components": [
+                {
+                    "name": "XY Plane",
+                    "fullName": "XY Plane",
+                    "description": "Creates an XY plane at the world origin or at a specified point",
+                    "inputs": [
+                        {"name": "Origin", "type": "Point", "description": "Origin point", "optional": True}
+                    ],
+                    "outputs": [
+                        {"name": "Plane", "type": "Plane", "description": "XY plane"}
+                    ]
+                },
+                {
+                    "name": "Construct Point",
+                    "fullName": "Construct Point",
+                    "description": "Constructs a point from X, Y, Z coordinates",
+                    "inputs": [
+                        {"name": "X", "type": "Number", "description": "X coordinate"},
+                        {"name": "Y", "type": "Number", "description": "Y coordinate"},
+                        {"name": "Z", "type": "Number", "description": "Z coordinate"}
+                    ],
+                    "outputs": [
+                        {"name": "Pt", "type": "Point", "description": "Constructed point"}
+                    ]
+                }
+            ]
+        },
+        {
+            "name": "Curve",
+            "components": [
+                {
+                    "name": "Circle",
+                    "fullName": "Circle",
+                    "description": "Creates a circle",
+                    "inputs": [
+                        {"name": "Plane", "type": "Plane", "description": "Base plane for the circle"},
+                        {"name": "Radius", "type": "Number", "description": "Circle radius"}
+                    ],
+                    "outputs": [
+                        {"name": "C", "type": "Circle", "description": "Circle output"}
+                    ]
+                },
+                {
+                    "name": "Line",
+                    "fullName": "Line",
+                    "description": "Creates a line between two points",
+                    "inputs": [
+                        {"name": "Start", "type": "Point", "description": "Start point"},
+                        {"name": "End", "type": "Point", "description": "End point"}
+                    ],
+                    "outputs": [
+                        {"name": "L", "type": "Line", "description": "Line output"}
+                    ]
+                }
+            ]
+        },
+        {
+            "name": "Surface",
+            "components": [
+                {
+                    "name": "Extrude",
+                    "fullName": "Extrude",
+                    "description": "Extrudes a curve to create a surface or a solid",
+                    "inputs": [
+                        {"name": "Base", "type": "Curve", "description": "Base curve to extrude"},
+                        {"name": "Direction", "type": "Vector", "description": "Direction of extrusion", "optional": True},
+                        {"name": "Height", "type": "Number", "description": "Height of extrusion"}
+                    ],
+                    "outputs": [
+                        {"name": "Brep", "type": "Brep", "description": "Extruded brep"}
+                    ]
+                }
+            ]
+        }
+    ],
+    "dataTypes": [
+        {
+            "name": "Number",
+            "description": "A numeric value",
+            "compatibleWith": ["Number", "Integer", "Double"]
+        },
+        {
+            "name": "Point",
+            "description": "A 3D point in space",
+            "compatibleWith": ["Point3d", "Point"]
+        },
+        {
+            "name": "Vector",
+            "description": "A 3D vector",
+            "compatibleWith": ["Vector3d", "Vector"]
+        },
+        {
+            "name": "Plane",
+            "description": "A plane in 3D space",
+            "compatibleWith": ["Plane"]
+        },
+        {
+            "name": "Circle",
+            "description": "A circle curve",
+            "compatibleWith": ["Circle", "Curve"]
+        },
+        {
+            "name": "Line",
+            "description": "A line segment",
+            "compatibleWith": ["Line", "Curve"]
+        },
+        {
+            "name": "Curve",
+            "description": "A curve object",
+            "compatibleWith": ["Curve", "Circle", "Line", "Arc", "Polyline"]
+        },
+        {
+            "name": "Brep",
+            "description": "A boundary representation object",
+            "compatibleWith": ["Brep", "Surface", "Solid"]
+        }
+    ]
+}
+
+_COMPONENT_LIBRARY_JSON = _dumps(_COMPONENT_LIBRARY).decode("utf-8")
+
+def _build_component_library_index(library: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """按名稱和全名索引組件庫中的組件"""
+    index = {}
+    for category in library.get("categories", []):
+        for lib_component in category.get("components", []):
+            for key in (lib_component.get("name"), lib_component.get("fullName")):
+                if key is not None:
+                    index.setdefault(key, lib_component)
+    return index
+
+# 組件庫是靜態數據，名稱索引在模塊加載時構建一次
+_COMPONENT_LIBRARY_INDEX = _build_component_library_index(_COMPONENT_LIBRARY)
 
 @server.resource("grasshopper://component_library")
 def get_component_library():
     """Get a comprehensive library of Grasshopper components"""
-    # 這個資源提供了一個更全面的組件庫，包括常用組件的詳細信息
-    return {
-        "categories": [
-            {
-                "name": "Params",
-                "components": [
-                    {
-                        "name": "Point",
-                        "fullName": "Point Parameter",
-                        "description": "Creates a point parameter",
-                        "inputs": [
-                            {"name": "X", "type": "Number", "description": "X coordinate"},
-                            {"name": "Y", "type": "Number", "description": "Y coordinate"},
-                            {"name": "Z", "type": "Number", "description": "Z coordinate"}
-                        ],
-                        "outputs": [
-                            {"name": "Pt", "type": "Point", "description": "Point output"}
-                        ]
-                    },
-                    {
-                        "name": "Number Slider",
-                        "fullName": "Number Slider",
-                        "description": "Creates a slider for numeric input with adjustable range and precision",
-                        "inputs": [],
-                        "outputs": [
-                            {"name": "N", "type": "Number", "description": "Number output"}
-                        ],
-                        "settings": {
-                            "min": {"description": "Minimum value of the slider", "default": 0},
-                            "max": {"description": "Maximum value of the slider", "default": 10},
-                            "value": {"description": "Current value of the slider", "default": 5},
-                            "rounding": {"description": "Rounding precision (0.01, 0.1, 1, etc.)", "default": 0.1},
-                            "type": {"description": "Slider type (integer, floating point)", "default": "float"},
-                            "name": {"description": "Custom name for the slider", "default": ""}
-                        },
-                        "usage_examples": [
-                            "Create a Number Slider with min=0, max=100, value=50",
-                            "Create a Number Slider for radius with min=0.1, max=10, value=2.5, rounding=0.1"
-                        ],
-                        "common_issues": [
-                            "Confusing with other slider types",
-                            "Not setting appropriate min/max values for the intended use"
-                        ],
-                        "disambiguation": {
-                            "similar_components": [
-                                {
-                                    "name": "MD Slider",
-                                    "description": "Multi-dimensional slider for vector input, NOT for simple numeric values",
-                                    "how_to_distinguish": "Use Number Slider for single numeric values; use MD Slider only when you need multi-dimensional control"
-                                },
-                                {
-                                    "name": "Graph Mapper",
-                                    "description": "Maps values through a graph function, NOT a simple slider",
-                                    "how_to_distinguish": "Use Number Slider for direct numeric input; use Graph Mapper only for function-based mapping"
-                                }
-                            ],
-                            "correct_usage": "When needing a simple numeric input control, ALWAYS use 'Number Slider', not MD Slider or other variants"
-                        }
-                    },
-                    {
-                        "name": "Panel",
-                        "fullName": "Panel",
-                        "description": "Displays text or numeric data",
-                        "inputs": [
-                            {"name": "Input", "type": "Any", "description": "Any input data"}
-                        ],
-                        "outputs": []
-                    }
-                ]
-            },
-            {
-                "name": "Maths",
-                "components": [
-                    {
-                        "name": "Math",
-                        "fullName": "Mathematics",
-                        "description": "Performs mathematical operations",
-                        "inputs": [
-                            {"name": "A", "type": "Number", "description": "First number"},
-                            {"name": "B", "type": "Number", "description": "Second number"}
-                        ],
-                        "outputs": [
-                            {"name": "Result", "type": "Number", "description": "Result of the operation"}
-                        ],
-                        "operations": ["Addition", "Subtraction", "Multiplication", "Division", "Power", "Modulo"]
-                    }
-                ]
-            },
-            {
-                "name": "Vector",
-                "components": [
-                    {
-                        "name": "XY Plane",
-                        "fullName": "XY Plane",
-                        "description": "Creates an XY plane at the world origin or at a specified point",
-                        "inputs": [
-                            {"name": "Origin", "type": "Point", "description": "Origin point", "optional": True}
-                        ],
-                        "outputs": [
-                            {"name": "Plane", "type": "Plane", "description": "XY plane"}
-                        ]
-                    },
-                    {
-                        "name": "Construct Point",
-                        "fullName": "Construct Point",
-                        "description": "Constructs a point from X, Y, Z coordinates",
-                        "inputs": [
-                            {"name": "X", "type": "Number", "description": "X coordinate"},
-                            {"name": "Y", "type": "Number", "description": "Y coordinate"},
-                            {"name": "Z", "type": "Number", "description": "Z coordinate"}
-                        ],
-                        "outputs": [
-                            {"name": "Pt", "type": "Point", "description": "Constructed point"}
-                        ]
-                    }
-                ]
-            },
-            {
-                "name": "Curve",
-                "components": [
-                    {
-                        "name": "Circle",
-                        "fullName": "Circle",
-                        "description": "Creates a circle",
-                        "inputs": [
-                            {"name": "Plane", "type": "Plane", "description": "Base plane for the circle"},
-                            {"name": "Radius", "type": "Number", "description": "Circle radius"}
-                        ],
-                        "outputs": [
-                            {"name": "C", "type": "Circle", "description": "Circle output"}
-                        ]
-                    },
-                    {
-                        "name": "Line",
-                        "fullName": "Line",
-                        "description": "Creates a line between two points",
-                        "inputs": [
-                            {"name": "Start", "type": "Point", "description": "Start point"},
-                            {"name": "End", "type": "Point", "description": "End point"}
-                        ],
-                        "outputs": [
-                            {"name": "L", "type": "Line", "description": "Line output"}
-                        ]
-                    }
-                ]
-            },
-            {
-                "name": "Surface",
-                "components": [
-                    {
-                        "name": "Extrude",
-                        "fullName": "Extrude",
-                        "description": "Extrudes a curve to create a surface or a solid",
-                        "inputs": [
-                            {"name": "Base", "type": "Curve", "description": "Base curve to extrude"},
-                            {"name": "Direction", "type": "Vector", "description": "Direction of extrusion", "optional": True},
-                            {"name": "Height", "type": "Number", "description": "Height of extrusion"}
-                        ],
-                        "outputs": [
-                            {"name": "Brep", "type": "Brep", "description": "Extruded brep"}
-                        ]
-                    }
-                ]
-            }
-        ],
-        "dataTypes": [
-            {
-                "name": "Number",
-                "description": "A numeric value",
-                "compatibleWith": ["Number", "Integer", "Double"]
-            },
-            {
-                "name": "Point",
-                "description": "A 3D point in space",
-                "compatibleWith": ["Point3d", "Point"]
-            },
-            {
-                "name": "Vector",
-                "description": "A 3D vector",
-                "compatibleWith": ["Vector3d", "Vector"]
-            },
-            {
-                "name": "Plane",
-                "description": "A plane in 3D space",
-                "compatibleWith": ["Plane"]
-            },
-            {
-                "name": "Circle",
-                "description": "A circle curve",
-                "compatibleWith": ["Circle", "Curve"]
-            },
-            {
-                "name": "Line",
-                "description": "A line segment",
-                "compatibleWith": ["Line", "Curve"]
-            },
-            {
-                "name": "Curve",
-                "description": "A curve object",
-                "compatibleWith": ["Curve", "Circle", "Line", "Arc", "Polyline"]
-            },
-            {
-                "name": "Brep",
-                "description": "A boundary representation object",
-                "compatibleWith": ["Brep", "Surface", "Solid"]
-            }
-        ]
-    }
+    return _COMPONENT_LIBRARY_JSON
 
 def main():
     """Main entry point for the Grasshopper MCP Bridge Server"""
+    # 日誌輸出到 stderr，stdout 保留給 MCP 協議；無效的日誌級別回退到 WARNING
+    log_level = (os.environ.get("GRASSHOPPER_MCP_LOG_LEVEL") or "WARNING").upper()
+    valid_level = isinstance(logging.getLevelName(log_level), int)
+    logging.basicConfig(
+        level=log_level if valid_level else "WARNING",
+        stream=sys.stderr,
+        format="%(levelname)s: %(message)s"
+    )
+    if not valid_level:
+        _LOG.warning("Invalid GRASSHOPPER_MCP_LOG_LEVEL '%s', using WARNING", log_level)
+    
     try:
         # 啟動 MCP 服務器
         print("Starting Grasshopper MCP Bridge Server...", file=sys.stderr)
@@ -15,6 +15,9 @@ setup(
         "websockets>=10.0",
         "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0"],
+    },
     entry_points={
         "console_scripts": [
             "grasshopper-mcp=grasshopper_mcp.bridge:main",